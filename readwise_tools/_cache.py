@@ -0,0 +1,78 @@
+"""
+Short-lived on-disk cache for Readwise Reader document listings.
+
+Running several tools back to back (e.g. readwise-tag-filter followed by
+readwise-open-links) would otherwise paginate the same location again for
+every invocation.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/readwise_tools")
+CACHE_TTL = 300
+
+
+def _cache_path(params, token):
+    # Key on the token too, so one account's listing is never served to another
+    key = json.dumps([hashlib.sha256(token.encode()).hexdigest(), params], sort_keys=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"documents-{digest}.pickle")
+
+
+def _load(path, ttl):
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Besides truncated files, a listing pickled before a readwise upgrade
+        # can fail with AttributeError or ImportError; refetch in every case
+        return None
+
+
+def _store(path, documents):
+    try:
+        # Listings include titles, summaries and notes, so keep them private
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        os.chmod(CACHE_DIR, 0o700)
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(documents, f)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Warning: Could not write document cache: {e}")
+
+
+def get_documents_cached(rw, params, token, ttl=CACHE_TTL, use_cache=True):
+    """Yield documents for params, from a recent cached listing if there is one.
+
+    The listing is only cached once pagination completes, so an error part
+    way through still reaches the caller after the documents fetched so far.
+    """
+    if not use_cache:
+        yield from rw.get_documents(params=params)
+        return
+
+    path = _cache_path(params, token)
+    cached = _load(path, ttl)
+    if cached is not None:
+        yield from cached
+        return
+
+    documents = []
+    for doc in rw.get_documents(params=params):
+        documents.append(doc)
+        yield doc
+    _store(path, documents)
+
+
+def clear_cache():
+    """Drop all cached listings, e.g. after documents were modified."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
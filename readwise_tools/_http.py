@@ -0,0 +1,32 @@
+"""
+Shared HTTP session setup for the tools that call REST APIs directly.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+def create_session(pool_maxsize=20, backoff_factor=0.3, retry_methods=()):
+    """Create a requests.Session with keep-alive pooling and retries for https.
+
+    Only idempotent methods are retried by default; pass e.g. {"PATCH"} in
+    retry_methods for requests that are safe to repeat. Once retries are
+    exhausted the last response is returned rather than raising, so callers
+    can check its status code.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | set(retry_methods),
+            raise_on_status=False
+        )
+    ))
+    return session
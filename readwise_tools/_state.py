@@ -0,0 +1,55 @@
+"""
+Persistent set of transferred item ids backed by sqlite.
+
+Membership checks hit the primary key index instead of reading a whole
+state file into memory, and inserts are committed in one transaction.
+"""
+
+import os
+import sqlite3
+
+
+class StateStore:
+    """Set-like store of transferred ids.
+
+    If the database does not exist yet and a line-based legacy state file
+    is given, its ids are imported so nothing is transferred twice.
+    """
+
+    def __init__(self, path, legacy_path=None):
+        is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS transferred (id TEXT PRIMARY KEY)")
+        if is_new and legacy_path and os.path.exists(legacy_path):
+            with open(legacy_path, 'r') as f:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO transferred (id) VALUES (?)",
+                    ((line.strip(),) for line in f if line.strip())
+                )
+        self.conn.commit()
+
+    def __contains__(self, item_id):
+        row = self.conn.execute(
+            "SELECT 1 FROM transferred WHERE id = ? LIMIT 1", (item_id,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM transferred").fetchone()[0]
+
+    def add(self, item_id):
+        self.conn.execute("INSERT OR IGNORE INTO transferred (id) VALUES (?)", (item_id,))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        # Always commit: ids added so far were transferred even if the run failed later
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
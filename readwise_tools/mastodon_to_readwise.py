@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from readwise import ReadwiseReader
+from readwise_tools._http import create_session
 from dotenv import load_dotenv
 import os
+import re
 from urllib.parse import urljoin
 
 load_dotenv()
@@ -12,6 +14,12 @@ MASTODON_INSTANCE = os.getenv("MASTODON_INSTANCE")
 MASTODON_TOKEN = os.getenv("MASTODON_TOKEN")
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 STATE_FILE = os.path.expanduser("~/.mastodon_transferred")
+MAX_WORKERS = 8
+BATCH_SIZE = 50
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Shared session so pagination reuses one keep-alive connection
+_session = create_session(pool_maxsize=10, backoff_factor=0.5)
 
 
 def load_transferred_bookmarks():
@@ -22,9 +30,8 @@ def load_transferred_bookmarks():
         return set()
 
 
-def append_transferred_bookmark(status_id):
-    with open(STATE_FILE, 'a') as f:
-        f.write(status_id + '\n')
+def append_transferred_bookmarks(state_fp, status_ids):
+    state_fp.writelines(status_id + '\n' for status_id in status_ids)
 
 
 def get_mastodon_bookmarks():
@@ -33,10 +40,10 @@ def get_mastodon_bookmarks():
     
     bookmarks = []
     url = urljoin(MASTODON_INSTANCE, "/api/v1/bookmarks")
-    headers = {"Authorization": f"Bearer {MASTODON_TOKEN}"}
+    _session.headers.update({"Authorization": f"Bearer {MASTODON_TOKEN}"})
     
     while url:
-        response = requests.get(url, headers=headers, params={"limit": 40})
+        response = _session.get(url, params={"limit": 40})
         response.raise_for_status()
         
         batch = response.json()
@@ -59,8 +66,7 @@ def send_bookmark_to_readwise(status, rw: ReadwiseReader):
         # Extract content from status
         content = status.get('content', '')
         # Remove HTML tags for summary
-        import re
-        clean_content = re.sub(r'<[^>]+>', '', content)
+        clean_content = _TAG_RE.sub('', content)
         
         # Get the URL - prefer the original URL if it's a reblog
         url = status.get('url', '')
@@ -85,8 +91,20 @@ def send_bookmark_to_readwise(status, rw: ReadwiseReader):
             ]
         )
         print(f"Saved to Readwise: {title}")
+        return True
     except Exception as e:
         print(f"Failed to save bookmark: {e}")
+        return False
+
+
+def send_batch(bookmarks, rw: ReadwiseReader, executor):
+    # The Reader API has no bulk save endpoint, so pipeline the batch over
+    # the executor and return the ids that were saved once all have finished
+    futures = {
+        executor.submit(send_bookmark_to_readwise, bookmark, rw): bookmark.get('id')
+        for bookmark in bookmarks
+    }
+    return [futures[future] for future in as_completed(futures) if future.result()]
 
 
 def main():
@@ -100,19 +118,31 @@ def main():
         transferred_ids = load_transferred_bookmarks()
         bookmarks = get_mastodon_bookmarks()
 
-        new_transfers = 0
+        # Also track queued ids so duplicates within one run are only sent once
+        new_bookmarks = []
+        queued_ids = set()
         for bookmark in bookmarks:
             status_id = bookmark.get('id')
-            if status_id not in transferred_ids:
-                send_bookmark_to_readwise(bookmark, rw)
-                append_transferred_bookmark(status_id)
-                new_transfers += 1
+            if status_id not in transferred_ids and status_id not in queued_ids:
+                queued_ids.add(status_id)
+                new_bookmarks.append(bookmark)
             else:
                 account = bookmark.get('account', {})
                 display_name = account.get('display_name') or account.get('username', 'Unknown')
                 print(f"Skipping already transferred bookmark from {display_name}")
-        
-        print(f"Transferred {new_transfers} new bookmarks. Total tracked: {len(transferred_ids) + new_transfers}")
+
+        # Uploads are independent, so overlap their round-trips; the state
+        # file is only written from this thread, once per batch
+        new_transfers = 0
+        with open(STATE_FILE, 'a', buffering=1) as state_fp, \
+                ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for start in range(0, len(new_bookmarks), BATCH_SIZE):
+                sent_ids = send_batch(new_bookmarks[start:start + BATCH_SIZE], rw, executor)
+                append_transferred_bookmarks(state_fp, sent_ids)
+                transferred_ids.update(sent_ids)
+                new_transfers += len(sent_ids)
+
+        print(f"Transferred {new_transfers} new bookmarks. Total tracked: {len(transferred_ids)}")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pycketcasts import PocketCast
 from readwise import ReadwiseReader
 from dotenv import load_dotenv
@@ -11,6 +12,8 @@ POCKETCASTS_EMAIL = os.getenv("POCKETCASTS_EMAIL")
 POCKETCASTS_PASSWORD = os.getenv("POCKETCASTS_PASSWORD")
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 STATE_FILE = os.path.expanduser("~/.pocketcasts_transferred")
+MAX_WORKERS = 8
+BATCH_SIZE = 50
 
 
 def load_transferred_episodes():
@@ -20,9 +23,8 @@ def load_transferred_episodes():
     except FileNotFoundError:
         return set()
 
-def append_transferred_episode(uuid):
-    with open(STATE_FILE, 'a') as f:
-        f.write(uuid + '\n')
+def append_transferred_episodes(state_fp, uuids):
+    state_fp.writelines(uuid + '\n' for uuid in uuids)
 
 def get_starred_episodes():
     client = PocketCast(email=POCKETCASTS_EMAIL, password=POCKETCASTS_PASSWORD)
@@ -42,8 +44,16 @@ def send_episode_to_readwise(episode, rw: ReadwiseReader):
             ]
         )
         print(f"Saved to Readwise: {episode.title}")
+        return True
     except Exception as e:
         print(f"Failed to save: {episode.title} – {e}")
+        return False
+
+def send_batch(episodes, rw: ReadwiseReader, executor):
+    # The Reader API has no bulk save endpoint, so pipeline the batch over
+    # the executor and return the uuids that were saved once all have finished
+    futures = {executor.submit(send_episode_to_readwise, ep, rw): ep.uuid for ep in episodes}
+    return [futures[future] for future in as_completed(futures) if future.result()]
 
 def main():
     if not (POCKETCASTS_EMAIL and POCKETCASTS_PASSWORD and READWISE_TOKEN):
@@ -54,16 +64,26 @@ def main():
     transferred_uuids = load_transferred_episodes()
     episodes = get_starred_episodes()
 
-    new_transfers = 0
+    # Also track queued uuids so duplicates within one run are only sent once
+    new_episodes = []
+    queued_uuids = set()
     for ep in episodes:
-        if ep.uuid not in transferred_uuids:
-            send_episode_to_readwise(ep, rw)
-            append_transferred_episode(ep.uuid)
-            new_transfers += 1
+        if ep.uuid not in transferred_uuids and ep.uuid not in queued_uuids:
+            queued_uuids.add(ep.uuid)
+            new_episodes.append(ep)
         else:
             print(f"Skipping already transferred: {ep.title}")
-    
-    print(f"Transferred {new_transfers} new episodes. Total tracked: {len(transferred_uuids) + new_transfers}")
+
+    new_transfers = 0
+    with open(STATE_FILE, 'a', buffering=1) as state_fp, \
+            ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for start in range(0, len(new_episodes), BATCH_SIZE):
+            sent_uuids = send_batch(new_episodes[start:start + BATCH_SIZE], rw, executor)
+            append_transferred_episodes(state_fp, sent_uuids)
+            transferred_uuids.update(sent_uuids)
+            new_transfers += len(sent_uuids)
+
+    print(f"Transferred {new_transfers} new episodes. Total tracked: {len(transferred_uuids)}")
 
 
 if __name__ == "__main__":
@@ -15,8 +15,11 @@ Example usage:
 
 import os
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from readwise import ReadwiseReader
+from readwise_tools._http import create_session
+from readwise_tools._cache import clear_cache
 import argparse
 import logging
 
@@ -24,15 +27,23 @@ load_dotenv()
 
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 READWISE_API_BASE = "https://readwise.io/api/v3"
+MAX_WORKERS = 8
 
+# Shared session so updates reuse keep-alive connections to readwise.io;
+# moving a document to the archive is idempotent, so PATCH is safe to retry
+_session = create_session(retry_methods={"PATCH"})
 
-def archive_document(document_id: str, token: str) -> bool:
+
+def archive_document(document_id: str) -> bool:
     """Archive a document via the Readwise API."""
     url = f"{READWISE_API_BASE}/update/{document_id}/"
-    headers = {"Authorization": f"Token {token}"}
     payload = {"location": "archive"}
 
-    response = requests.patch(url, headers=headers, json=payload)
+    try:
+        response = _session.patch(url, json=payload)
+    except requests.RequestException as e:
+        print(f"Request failed for document {document_id}: {e}")
+        return False
     return response.status_code == 200
 
 
@@ -80,6 +91,8 @@ def main():
         print(f"  Location: {args.location}")
         print()
 
+    _session.headers["Authorization"] = f"Token {READWISE_TOKEN}"
+
     try:
         rw = ReadwiseReader(token=READWISE_TOKEN)
 
@@ -107,7 +120,7 @@ def main():
         # Filter by tag locally
         filtered = [
             d for d in all_documents
-            if hasattr(d, 'tags') and d.tags and args.tag in d.tags
+            if args.tag in (getattr(d, 'tags', None) or ())
         ]
 
         if args.verbose:
@@ -130,30 +143,38 @@ def main():
             print("No documents to archive.")
             return
 
-        # Process documents
+        # Process documents, overlapping the PATCH round-trips on a thread pool
         success_count = 0
         error_count = 0
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for i, d in enumerate(to_archive, 1):
+                title = d.title if hasattr(d, 'title') else 'N/A'
+                category = d.category if hasattr(d, 'category') else 'N/A'
 
-        for i, d in enumerate(to_archive, 1):
-            title = d.title if hasattr(d, 'title') else 'N/A'
-            category = d.category if hasattr(d, 'category') else 'N/A'
+                if args.verbose or args.dry_run:
+                    print(f"[{i}/{len(to_archive)}] {title}")
+                    print(f"  Category: {category}")
+                    print(f"  Location: {d.location if hasattr(d, 'location') else 'N/A'}")
+                    print()
 
-            if args.verbose or args.dry_run:
-                print(f"[{i}/{len(to_archive)}] {title}")
-                print(f"  Category: {category}")
-                print(f"  Location: {d.location if hasattr(d, 'location') else 'N/A'}")
+                if not args.dry_run:
+                    futures[executor.submit(archive_document, d.id)] = title
 
-            if not args.dry_run:
-                if archive_document(d.id, READWISE_TOKEN):
+            for future in as_completed(futures):
+                title = futures[future]
+                if future.result():
                     success_count += 1
                     if args.verbose:
-                        print("  Status: Archived successfully")
+                        print(f"Archived successfully: {title}")
                 else:
                     error_count += 1
-                    print(f"  Status: Failed to archive")
+                    print(f"Failed to archive: {title}")
 
-            if args.verbose or args.dry_run:
-                print()
+        # Cached listings no longer reflect the archived documents
+        if success_count:
+            clear_cache()
 
         # Summary
         if args.dry_run:
@@ -165,6 +186,8 @@ def main():
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        _session.close()
 
 
 if __name__ == "__main__":
@@ -6,11 +6,15 @@ from dotenv import load_dotenv
 from readwise import ReadwiseReader
 import argparse
 import logging
+from urllib.parse import urlparse
 
 load_dotenv()
 
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 
+PODCAST_HOSTS = frozenset({"pocketcasts.com", "pca.st"})
+VIDEO_HOSTS = frozenset({"youtube.com", "youtu.be"})
+
 
 def format_markdown(title, url, label=None):
     """Format a link as Markdown."""
@@ -24,18 +28,47 @@ def format_org(title, url, label=None):
     return f"- [[{url}][{title}]]{suffix}"
 
 
+def host_matches(host, domains):
+    """Check whether host is one of domains or a subdomain of one."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
 def get_document_label(doc):
     """Determine a label for the document based on category or URL."""
-    url = doc.source_url
+    # hostname drops any port and userinfo, and is already lowercase
+    host = urlparse(doc.source_url or '').hostname or ''
     category = doc.category if hasattr(doc, 'category') else None
 
-    if category == 'podcast' or 'pocketcasts.com' in url or 'pca.st' in url:
+    if category == 'podcast' or host_matches(host, PODCAST_HOSTS):
         return 'Podcast'
-    if category == 'video' or 'youtube.com' in url or 'youtu.be' in url:
+    if category == 'video' or host_matches(host, VIDEO_HOSTS):
         return 'YouTube'
     return None
 
 
+def document_title(d):
+    """Return the document title, falling back to its URL."""
+    return d.title if hasattr(d, 'title') and d.title else d.source_url
+
+
+def describe_document(d):
+    """Format the verbose details block for a document."""
+    category = d.category if hasattr(d, 'category') else 'N/A'
+    tags = ', '.join(d.tags) if hasattr(d, 'tags') and d.tags else 'None'
+    return (
+        f"Document:\n"
+        f"  Title: {document_title(d)}\n"
+        f"  URL: {d.source_url}\n"
+        f"  Category: {category}\n"
+        f"  Tags: {tags}\n\n"
+    )
+
+
+def format_document(d, formatter):
+    """Format a single document as a link line."""
+    return formatter(document_title(d), d.source_url, get_document_label(d))
+
+
 def main():
     logging.basicConfig()
     logging.getLogger().setLevel(logging.INFO)
@@ -71,44 +104,30 @@ def main():
 
         if args.verbose:
             print(f"Querying Readwise Reader API...")
-            print(f"Fetching all documents from location='later'...")
-
-        # Fetch all documents from 'later' location
-        all_documents = list(rw.get_documents(params={"location": "later"}))
-
-        if args.verbose:
-            print(f"Received {len(all_documents)} documents from API")
-            print(f"Filtering locally by tag: '{tag_to_filter}'...")
+            print(f"Fetching documents from location='later', filtering locally by tag: '{tag_to_filter}'...")
 
-        # Filter documents by tag locally (API tag filtering doesn't seem to work)
-        documents = [d for d in all_documents if hasattr(d, 'tags') and d.tags and tag_to_filter in d.tags]
+        # Filter documents by tag locally while paginating (API tag filtering doesn't seem to work)
+        documents = [
+            d for d in rw.get_documents(params={"location": "later"})
+            if tag_to_filter in (getattr(d, 'tags', None) or ())
+        ]
 
         if args.verbose:
             print(f"Found {len(documents)} documents with tag '{tag_to_filter}'\n")
 
-        lines = []
-        for d in documents:
-            title = d.title if hasattr(d, 'title') and d.title else d.source_url
-            label = get_document_label(d)
-
-            if args.verbose:
-                print(f"Document:")
-                print(f"  Title: {title}")
-                print(f"  URL: {d.source_url}")
-                print(f"  Category: {d.category if hasattr(d, 'category') else 'N/A'}")
-                print(f"  Tags: {', '.join(d.tags) if hasattr(d, 'tags') and d.tags else 'None'}")
-                print()
-
-            lines.append(formatter(title, d.source_url, label))
+        # Print all details before any links, so stdout ends in a clean link list
+        if args.verbose:
+            sys.stdout.writelines(describe_document(d) for d in documents)
 
-        output_text = "\n".join(lines)
+        lines = (format_document(d, formatter) + "\n" for d in documents)
 
+        # Stream lines straight to the destination instead of joining them first
         if args.output:
             with open(args.output, 'w') as f:
-                f.write(output_text + "\n")
+                f.writelines(lines)
             print(f"Exported {len(documents)} links with tag '{tag_to_filter}' to {args.output}")
         else:
-            print(output_text)
+            sys.stdout.writelines(lines)
 
     except Exception as e:
         print(f"Error: {e}")
@@ -16,15 +16,37 @@ Features:
 """
 
 import os
+import sys
 import argparse
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from readwise import ReadwiseReader
 from tabulate import tabulate
 
 
+TABLE_HEADERS = ["Feed Name", "Total", "Weekly Avg", "Read Later", "Later %"]
+
+# Tabs and line breaks in feed names would split tsv rows
+TSV_UNSAFE = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
+
+
+@dataclass
+class FeedStat:
+    """Aggregated statistics for a single feed."""
+    total: int = 0
+    later_count: int = 0
+    weeks: Counter = field(default_factory=Counter)
+    site_name: str = ''
+    source: str = ''
+    weekly_avg: float = 0.0
+    later_pct: float = 0.0
+
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -75,6 +97,14 @@ def parse_arguments():
         help="Filter by category (rss, article, email, etc.)"
     )
 
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="simple",
+        choices=["simple", "tsv"],
+        help="Output format (tsv writes tab-separated rows only)"
+    )
+
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -104,6 +134,12 @@ def calculate_time_range(args):
     return cutoff_date, time_unit, days
 
 
+def report(args, message):
+    """Print progress or a warning, to stderr when stdout carries tsv rows."""
+    print(message, file=sys.stderr if args.format == "tsv" else sys.stdout)
+
+
+@lru_cache(maxsize=4096)
 def extract_domain(url):
     """Extract domain from URL as fallback feed identifier."""
     if not url:
@@ -115,6 +151,57 @@ def extract_domain(url):
         return "unknown"
 
 
+def fetch_location(rw, location, cutoff_date, args):
+    """Fetch and filter documents from a single location.
+
+    Returns the matching documents and the number of documents retrieved.
+    """
+    if args.verbose:
+        report(args, f"  Fetching from location='{location}'...")
+
+    # updatedAfter filters by modification time; anything created after the
+    # cutoff was also updated after it, so this only trims older documents.
+    # The created_at check below still applies the exact time range.
+    params = {"location": location, "updatedAfter": cutoff_date.isoformat()}
+    location_docs = []
+    location_count = 0
+    missing_created_at = 0
+
+    # Iterate through generator to handle pagination errors gracefully,
+    # filtering by created_at and category as documents stream in
+    try:
+        for d in rw.get_documents(params=params):
+            location_count += 1
+            # Filter by category locally first, it rejects most documents
+            if getattr(d, 'category', None) != args.category:
+                continue
+            # Check if document has created_at and it's after cutoff
+            created_at = getattr(d, 'created_at', None)
+            if not created_at:
+                missing_created_at += 1
+            elif created_at >= cutoff_date:
+                location_docs.append(d)
+    except Exception as e:
+        # If we hit an error during pagination (malformed JSON in a document),
+        # we keep the documents we successfully retrieved before the error
+        if location_count:
+            report(args, f"  Warning: Error during pagination for '{location}' after {location_count} docs: {e}")
+            if args.verbose:
+                report(args, f"    Continuing with {location_count} documents retrieved before error")
+        else:
+            report(args, f"  Warning: Error fetching from location '{location}': {e}")
+            if args.verbose:
+                import traceback
+                traceback.print_exc()
+
+    if args.verbose and location_count:
+        report(args, f"    Retrieved {location_count} documents from '{location}'")
+    if args.verbose and missing_created_at:
+        report(args, f"    Warning: Skipped {missing_created_at} documents in '{location}' without a created_at timestamp")
+
+    return location_docs, location_count
+
+
 def fetch_documents(rw, cutoff_date, args):
     """Fetch documents from Readwise Reader API."""
     # Note: We don't use category in params due to a Readwise API bug
@@ -122,8 +209,6 @@ def fetch_documents(rw, cutoff_date, args):
     # We also can't fetch without any filters due to malformed documents in the full dataset.
     # Instead, we fetch by location separately and combine results.
 
-    all_docs = []
-
     if args.location != "all":
         # User specified a specific location
         locations_to_fetch = [args.location]
@@ -132,79 +217,44 @@ def fetch_documents(rw, cutoff_date, args):
         locations_to_fetch = ["new", "later", "archive", "feed"]
 
     if args.verbose:
-        print(f"Cutoff date: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        print(f"Will filter locally by category: {args.category}")
-        print(f"Fetching from locations: {locations_to_fetch}")
+        report(args, f"Cutoff date: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        report(args, f"Will filter locally by category: {args.category}")
+        report(args, f"Fetching from locations: {locations_to_fetch}")
 
-    # Fetch from each location separately
-    for location in locations_to_fetch:
-        if args.verbose:
-            print(f"  Fetching from location='{location}'...")
-
-        params = {"location": location}
-        location_docs = []
-
-        # Iterate through generator to handle pagination errors gracefully
-        try:
-            for doc in rw.get_documents(params=params):
-                location_docs.append(doc)
-        except Exception as e:
-            # If we hit an error during pagination (malformed JSON in a document),
-            # we keep the documents we successfully retrieved before the error
-            if location_docs:
-                print(f"  Warning: Error during pagination for '{location}' after {len(location_docs)} docs: {e}")
-                if args.verbose:
-                    print(f"    Continuing with {len(location_docs)} documents retrieved before error")
-            else:
-                print(f"  Warning: Error fetching from location '{location}': {e}")
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
-
-        all_docs.extend(location_docs)
-        if args.verbose and location_docs:
-            print(f"    Retrieved {len(location_docs)} documents from '{location}'")
-
-    # Filter by created_at and category
     filtered_docs = []
-    for d in all_docs:
-        # Check if document has created_at and it's after cutoff
-        if hasattr(d, 'created_at') and d.created_at:
-            if d.created_at >= cutoff_date:
-                # Filter by category locally
-                if hasattr(d, 'category') and d.category == args.category:
-                    filtered_docs.append(d)
-        elif args.verbose:
-            print(f"Warning: Document '{getattr(d, 'title', 'Unknown')[:50]}' has no created_at timestamp")
+    total_retrieved = 0
+    for location in locations_to_fetch:
+        location_docs, location_count = fetch_location(rw, location, cutoff_date, args)
+        filtered_docs.extend(location_docs)
+        total_retrieved += location_count
 
     if args.verbose:
-        print(f"Total retrieved: {len(all_docs)} documents across all locations")
-        print(f"Filtered to: {len(filtered_docs)} documents (time range + category={args.category})")
+        report(args, f"Total retrieved: {total_retrieved} documents across all locations")
+        report(args, f"Filtered to: {len(filtered_docs)} documents (time range + category={args.category})")
 
     return filtered_docs
 
 
 def process_documents(documents, args):
     """Process documents and build statistics."""
-    feed_stats = defaultdict(lambda: {
-        'total': 0,
-        'later_count': 0,
-        'weeks': defaultdict(int),
-        'site_name': '',
-        'source': '',
-    })
+    feed_stats = {}
 
     for doc in documents:
+        # Read each attribute once; documents may lack some of them
+        site_name = getattr(doc, 'site_name', None) or ''
+        source = getattr(doc, 'source', None) or ''
+        created_at = getattr(doc, 'created_at', None)
+
         # Identify feed (priority: site_name > source > domain)
         # Note: For RSS feeds, source is often just "Reader RSS", so site_name is more specific
         feed_id = None
 
         # Try site_name first (most specific for RSS feeds)
-        if hasattr(doc, 'site_name') and doc.site_name:
-            feed_id = doc.site_name
+        if site_name:
+            feed_id = site_name
         # Fallback to source
-        elif hasattr(doc, 'source') and doc.source and doc.source != 'Reader RSS':
-            feed_id = doc.source
+        elif source and source != 'Reader RSS':
+            feed_id = source
         # Fallback to domain extraction
         else:
             source_url = getattr(doc, 'source_url', None) or getattr(doc, 'url', None)
@@ -213,44 +263,46 @@ def process_documents(documents, args):
         if not feed_id or feed_id == 'unknown':
             if args.verbose:
                 title = getattr(doc, 'title', 'Unknown')[:50]
-                print(f"Warning: Could not identify feed for document '{title}'")
+                report(args, f"Warning: Could not identify feed for document '{title}'")
             continue
 
-        stats = feed_stats[feed_id]
-        stats['total'] += 1
+        stats = feed_stats.get(feed_id)
+        if stats is None:
+            stats = feed_stats[feed_id] = FeedStat()
+        stats.total += 1
 
         # Store metadata (first occurrence only)
-        if not stats['site_name'] and hasattr(doc, 'site_name'):
-            stats['site_name'] = doc.site_name or ''
-        if not stats['source'] and hasattr(doc, 'source'):
-            stats['source'] = doc.source or ''
+        if not stats.site_name:
+            stats.site_name = site_name
+        if not stats.source:
+            stats.source = source
 
         # Count "read later" items
-        if hasattr(doc, 'location') and doc.location == 'later':
-            stats['later_count'] += 1
+        if getattr(doc, 'location', None) == 'later':
+            stats.later_count += 1
 
         # Track by week (ISO week)
-        if hasattr(doc, 'created_at') and doc.created_at:
-            week_key = doc.created_at.strftime('%Y-W%W')
-            stats['weeks'][week_key] += 1
+        if created_at:
+            iso = created_at.isocalendar()
+            stats.weeks[(iso[0], iso[1])] += 1
 
     # Calculate aggregates
     for feed_id, stats in list(feed_stats.items()):
-        num_weeks = len(stats['weeks'])
+        num_weeks = len(stats.weeks)
         if num_weeks > 0:
-            stats['weekly_avg'] = stats['total'] / num_weeks
+            stats.weekly_avg = stats.total / num_weeks
         else:
-            stats['weekly_avg'] = stats['total']
+            stats.weekly_avg = stats.total
 
-        if stats['total'] > 0:
-            stats['later_pct'] = (stats['later_count'] / stats['total']) * 100
+        if stats.total > 0:
+            stats.later_pct = (stats.later_count / stats.total) * 100
         else:
-            stats['later_pct'] = 0.0
+            stats.later_pct = 0.0
 
     # Filter by min_articles
     feed_stats = {
         k: v for k, v in feed_stats.items()
-        if v['total'] >= args.min_articles
+        if v.total >= args.min_articles
     }
 
     return feed_stats
@@ -258,12 +310,19 @@ def process_documents(documents, args):
 
 def display_stats(feed_stats, time_unit, days, args):
     """Display statistics as a formatted table."""
-    print(f"\nRSS Feed Statistics (Last {time_unit})")
-    print("=" * 80)
-    print()
+    tsv = args.format == "tsv"
+
+    if not tsv:
+        print(f"\nRSS Feed Statistics (Last {time_unit})")
+        print("=" * 80)
+        print()
 
     if not feed_stats:
-        print("No feeds found matching criteria.")
+        if tsv:
+            # Scripts still get a header, just without rows
+            sys.stdout.write("\t".join(TABLE_HEADERS) + "\n")
+        else:
+            print("No feeds found matching criteria.")
         return
 
     # Prepare table data
@@ -273,22 +332,23 @@ def display_stats(feed_stats, time_unit, days, args):
 
     for feed_id, stats in feed_stats.items():
         # Use site_name if available, otherwise source, otherwise feed_id
-        display_name = stats['site_name'] or stats['source'] or feed_id
+        display_name = stats.site_name or stats.source or feed_id
 
         # Truncate long names
-        if len(display_name) > 40:
+        if not tsv and len(display_name) > 40:
             display_name = display_name[:37] + "..."
 
-        table_data.append([
+        # Keep numeric values so sorting doesn't need to parse strings
+        table_data.append((
             display_name,
-            stats['total'],
-            f"{stats['weekly_avg']:.1f}",
-            stats['later_count'],
-            f"{stats['later_pct']:.1f}%"
-        ])
+            stats.total,
+            stats.weekly_avg,
+            stats.later_count,
+            stats.later_pct
+        ))
 
-        total_articles += stats['total']
-        total_later += stats['later_count']
+        total_articles += stats.total
+        total_later += stats.later_count
 
     # Sort table based on sort_by argument
     sort_index = {
@@ -299,23 +359,26 @@ def display_stats(feed_stats, time_unit, days, args):
         'later_pct': 4
     }.get(args.sort_by, 1)
 
-    # Custom sort to handle numeric vs string values
-    def sort_key(row):
-        value = row[sort_index]
-        if isinstance(value, str):
-            if '%' in value:
-                return float(value.rstrip('%'))
-            try:
-                return float(value)
-            except ValueError:
-                return value
-        return value
+    table_data.sort(key=itemgetter(sort_index), reverse=True)
+
+    # TSV is for machine consumption: write rows directly, without the
+    # formatted table, summary or breakdown
+    if tsv:
+        write = sys.stdout.write
+        write("\t".join(TABLE_HEADERS) + "\n")
+        for name, total, weekly_avg, later_count, later_pct in table_data:
+            name = name.translate(TSV_UNSAFE)
+            write(f"{name}\t{total}\t{weekly_avg:.1f}\t{later_count}\t{later_pct:.1f}\n")
+        return
 
-    table_data.sort(key=sort_key, reverse=True)
+    # Format numeric columns only for display
+    table_rows = [
+        [name, total, f"{weekly_avg:.1f}", later_count, f"{later_pct:.1f}%"]
+        for name, total, weekly_avg, later_count, later_pct in table_data
+    ]
 
     # Display table
-    headers = ["Feed Name", "Total", "Weekly Avg", "Read Later", "Later %"]
-    print(tabulate(table_data, headers=headers, tablefmt="simple"))
+    print(tabulate(table_rows, headers=TABLE_HEADERS, tablefmt="simple"))
 
     # Summary
     print(f"\nSummary:")
@@ -332,23 +395,28 @@ def display_stats(feed_stats, time_unit, days, args):
         print("=" * 80)
 
         # Sort feeds by total for verbose output
-        sorted_feeds = sorted(feed_stats.items(), key=lambda x: x[1]['total'], reverse=True)
+        sorted_feeds = sorted(feed_stats.items(), key=lambda x: x[1].total, reverse=True)
 
         for feed_id, stats in sorted_feeds[:10]:  # Show top 10 feeds
-            display_name = stats['site_name'] or stats['source'] or feed_id
-            print(f"\n{display_name}:")
-            print(f"  Total: {stats['total']} articles")
+            display_name = stats.site_name or stats.source or feed_id
+            lines = [
+                f"\n{display_name}:",
+                f"  Total: {stats.total} articles",
+                "  Weekly breakdown:",
+            ]
 
             # Sort weeks in reverse chronological order
-            weeks_sorted = sorted(stats['weeks'].items(), reverse=True)
-            print(f"  Weekly breakdown:")
-            for week, count in weeks_sorted[:4]:  # Show last 4 weeks
-                print(f"    {week}: {count} articles")
+            weeks_sorted = sorted(stats.weeks.items(), reverse=True)
+            for (year, week), count in weeks_sorted[:4]:  # Show last 4 weeks
+                lines.append(f"    {year}-W{week:02d}: {count} articles")
 
             if len(weeks_sorted) > 4:
-                print(f"    ... and {len(weeks_sorted) - 4} more weeks")
+                lines.append(f"    ... and {len(weeks_sorted) - 4} more weeks")
+
+            lines.append(f"  Read Later: {stats.later_count} ({stats.later_pct:.1f}%)")
 
-            print(f"  Read Later: {stats['later_count']} ({stats['later_pct']:.1f}%)")
+            # One write per feed instead of one per line
+            print("\n".join(lines))
 
 
 def main():
@@ -375,13 +443,14 @@ def main():
         print(f"  Category filter: {args.category}")
         print(f"  Minimum articles: {args.min_articles}")
         print(f"  Sort by: {args.sort_by}")
+        print(f"  Format: {args.format}")
         print(f"  Verbose: {args.verbose}")
         return
 
     try:
         # Initialize API client
         if args.verbose:
-            print("Initializing Readwise Reader client...")
+            report(args, "Initializing Readwise Reader client...")
         rw = ReadwiseReader(token=READWISE_TOKEN)
 
         # Calculate time range
@@ -389,23 +458,23 @@ def main():
 
         # Fetch documents
         if args.verbose:
-            print(f"Fetching documents from the last {time_unit}...")
+            report(args, f"Fetching documents from the last {time_unit}...")
         documents = fetch_documents(rw, cutoff_date, args)
 
-        if not documents:
+        if not documents and args.format != "tsv":
             print(f"No documents found in the last {time_unit}.")
             return
 
         # Process statistics
         if args.verbose:
-            print(f"Processing {len(documents)} documents...")
+            report(args, f"Processing {len(documents)} documents...")
         feed_stats = process_documents(documents, args)
 
         # Display results
         display_stats(feed_stats, time_unit, days, args)
 
     except Exception as e:
-        print(f"Error: {e}")
+        report(args, f"Error: {e}")
         if args.verbose:
             import traceback
             traceback.print_exc()
@@ -2,26 +2,70 @@
 
 import webbrowser
 import os
+import shlex
+import subprocess
+from functools import lru_cache
 from dotenv import load_dotenv
-from readwise import ReadwiseReader
+from readwise_tools._cache import get_documents_cached
 import argparse
 import logging
+import sys
 
 load_dotenv()
 
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 BROWSER = os.getenv("BROWSER", "firefox")
 
+# Browsers that open every URL argument of one invocation in a new tab,
+# by executable name or flatpak app id
+MULTI_URL_BROWSERS = frozenset({
+    "firefox", "firefox-esr", "chromium", "chromium-browser",
+    "chrome", "google-chrome", "google-chrome-stable",
+    "org.mozilla.firefox", "org.chromium.Chromium", "com.google.Chrome"
+})
 
-def main():
-    logging.basicConfig()
-    logging.getLogger().setLevel(logging.INFO)
-    
-    if not READWISE_TOKEN:
-        print("Missing environment variables. Check your .env file.")
-        print("Required: READWISE_TOKEN")
-        return
+log = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=None)
+def get_browser():
+    """Resolve the webbrowser controller for BROWSER once."""
+    try:
+        return webbrowser.get(BROWSER)
+    except webbrowser.Error:
+        # Unknown BROWSER value, use the system default instead
+        return webbrowser.get()
+
+
+def open_in_browser(urls):
+    """Open all URLs in new tabs, with a single invocation where supported."""
+    # Firefox and Chromium both open every URL argument in a new tab, so one
+    # process replaces a fork and remoting round-trip per URL. The browser may
+    # be wrapped (e.g. 'flatpak run org.mozilla.firefox'), so any argument
+    # can name it. Other openers (xdg-open, open, wslview) take a single URL,
+    # and a '%s' in BROWSER is a per-URL template that only webbrowser
+    # substitutes.
+    command = [] if "%s" in BROWSER else shlex.split(BROWSER)
+    if any(os.path.basename(arg) in MULTI_URL_BROWSERS for arg in command):
+        try:
+            subprocess.Popen(
+                [*command, *urls],
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            return
+        except OSError:
+            pass
+
+    # Not a known multi-URL browser, let webbrowser open the URLs one by one
+    browser = get_browser()
+    for url in urls:
+        browser.open_new_tab(url)
+
+
+def parse_arguments():
+    """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Open Reader URLs in browser",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -29,45 +73,62 @@ def main():
     parser.add_argument("-t", "--tag", help="tag to filter by", required=True)
     parser.add_argument("-d", "--dry-run", action="store_true", help="show what would be opened without opening browser tabs")
     parser.add_argument("-v", "--verbose", action="store_true", help="output detailed information for debugging")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="always fetch documents instead of reusing a recent listing")
+    return parser.parse_args()
 
-    tag_to_filter = args.tag
 
-    try:
-        rw = ReadwiseReader(token=READWISE_TOKEN)
+def main():
+    logging.basicConfig()
+    logging.getLogger().setLevel(logging.INFO)
 
-        if args.verbose:
-            print(f"Querying Readwise Reader API...")
-            print(f"Fetching all documents from location='later'...")
+    # Parse before importing the API client so --help stays fast
+    args = parse_arguments()
+
+    if not READWISE_TOKEN:
+        print("Missing environment variables. Check your .env file.")
+        print("Required: READWISE_TOKEN")
+        return
 
-        # Fetch all documents from 'later' location
-        all_documents = list(rw.get_documents(params={"location": "later"}))
+    from readwise import ReadwiseReader
 
-        if args.verbose:
-            print(f"Received {len(all_documents)} documents from API")
-            print(f"Filtering locally by tag: '{tag_to_filter}'...")
+    tag_to_filter = args.tag
 
-        # Filter documents by tag locally (API tag filtering doesn't seem to work)
-        documents = [d for d in all_documents if hasattr(d, 'tags') and d.tags and tag_to_filter in d.tags]
+    if args.verbose:
+        # Per-document details are logged, so they cost nothing unless verbose
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+        log.setLevel(logging.DEBUG)
+
+    try:
+        rw = ReadwiseReader(token=READWISE_TOKEN)
 
         if args.verbose:
-            print(f"Found {len(documents)} documents with tag '{tag_to_filter}'\n")
-
-        opened_count = 0
-        for d in documents:
-            if args.verbose:
-                print(f"Document {opened_count + 1}:")
-                print(f"  Title: {d.title if hasattr(d, 'title') else 'N/A'}")
-                print(f"  URL: {d.source_url}")
-                print(f"  Tags: {', '.join(d.tags) if hasattr(d, 'tags') and d.tags else 'None'}")
-                print()
-
-            if args.dry_run:
-                if not args.verbose:
-                    print(f"Would open: {d.source_url}")
-            else:
-                webbrowser.get(BROWSER).open_new_tab(d.source_url)
-            opened_count += 1
+            print(f"Querying Readwise Reader API...")
+            print(f"Fetching documents from location='later', filtering locally by tag: '{tag_to_filter}'...")
+
+        # Filter documents by tag locally while paginating (API tag filtering doesn't seem to work)
+        urls = []
+        for d in get_documents_cached(rw, {"location": "later"}, READWISE_TOKEN, use_cache=not args.no_cache):
+            tags = getattr(d, 'tags', None)
+            if tag_to_filter not in (tags or ()):
+                continue
+
+            # Check first so the tag list is only joined when it is shown
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "Document %d:\n  Title: %s\n  URL: %s\n  Tags: %s\n",
+                    len(urls) + 1, getattr(d, 'title', 'N/A'), d.source_url, ', '.join(tags)
+                )
+
+            if args.dry_run and not args.verbose:
+                print(f"Would open: {d.source_url}")
+            urls.append(d.source_url)
+
+        opened_count = len(urls)
+        if urls and not args.dry_run:
+            open_in_browser(urls)
 
         if args.dry_run:
             print(f"\nDry run: Found {opened_count} documents with tag '{tag_to_filter}' that would be opened")
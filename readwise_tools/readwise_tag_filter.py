@@ -12,36 +12,52 @@ Example usage:
 
 import os
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from readwise import ReadwiseReader
+from readwise_tools._http import create_session
+from readwise_tools._cache import clear_cache
 import argparse
 import logging
+import sys
 
 load_dotenv()
 
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 READWISE_API_BASE = "https://readwise.io/api/v3"
+MAX_WORKERS = 8
 
+log = logging.getLogger(__name__)
 
-def update_document_tags(document_id: str, tags: list[str], token: str) -> bool:
+# Shared session so updates reuse keep-alive connections to readwise.io;
+# setting the tags list is idempotent, so PATCH is safe to retry
+_session = create_session(retry_methods={"PATCH"})
+
+
+def _tagset(d) -> frozenset:
+    """Return a document's tag names as a frozenset.
+
+    Reader returns tags as a dict keyed by name; lists are accepted too.
+    """
+    tags = getattr(d, 'tags', None)
+    return frozenset(tags.keys() if isinstance(tags, dict) else (tags or ()))
+
+
+def update_document_tags(document_id: str, tags: list[str]) -> bool:
     """Update a document's tags via the Readwise API."""
     url = f"{READWISE_API_BASE}/update/{document_id}/"
-    headers = {"Authorization": f"Token {token}"}
     payload = {"tags": tags}
 
-    response = requests.patch(url, headers=headers, json=payload)
+    try:
+        response = _session.patch(url, json=payload)
+    except requests.RequestException as e:
+        print(f"Request failed for document {document_id}: {e}")
+        return False
     return response.status_code == 200
 
 
-def main():
-    logging.basicConfig()
-    logging.getLogger().setLevel(logging.INFO)
-
-    if not READWISE_TOKEN:
-        print("Missing environment variables. Check your .env file.")
-        print("Required: READWISE_TOKEN")
-        return
-
+def parse_arguments():
+    """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Tag documents matching filter criteria",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -75,7 +91,28 @@ def main():
         action="store_true",
         help="output detailed information for debugging"
     )
-    args = parser.parse_args()
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig()
+    logging.getLogger().setLevel(logging.INFO)
+
+    # Parse first so --help works without a .env file
+    args = parse_arguments()
+
+    if not READWISE_TOKEN:
+        print("Missing environment variables. Check your .env file.")
+        print("Required: READWISE_TOKEN")
+        return
+
+    if args.verbose or args.dry_run:
+        # Per-document details are logged, so they cost nothing unless shown
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+        log.setLevel(logging.DEBUG)
 
     if args.dry_run:
         print("DRY RUN MODE - No changes will be made\n")
@@ -88,20 +125,39 @@ def main():
         print(f"  Add tag: {args.add_tag}")
         print()
 
+    _session.headers["Authorization"] = f"Token {READWISE_TOKEN}"
+
     try:
         rw = ReadwiseReader(token=READWISE_TOKEN)
 
         if args.verbose:
             print(f"Fetching documents from location='{args.location}'...")
 
-        # Fetch documents - use error handling for pagination issues
-        all_documents = []
+        # Fetch documents, classifying each one in a single pass while paginating:
+        # filter by category (API category filter is buggy) and existing tag, and
+        # skip documents that already have the target tag - use error handling
+        # for pagination issues
+        categories = set(args.category) if args.category else None
+        received_count = 0
+        already_tagged = 0
+        to_tag = []
         try:
+            # Always read fresh: the update replaces the whole tag list, so
+            # stale tags from a cached listing would revert recent changes
             for doc in rw.get_documents(params={"location": args.location}):
-                all_documents.append(doc)
+                received_count += 1
+                if categories and getattr(doc, 'category', None) not in categories:
+                    continue
+                tagset = _tagset(doc)
+                if args.has_tag and args.has_tag not in tagset:
+                    continue
+                if args.add_tag in tagset:
+                    already_tagged += 1
+                    continue
+                to_tag.append((doc, tagset))
         except Exception as e:
-            if all_documents:
-                print(f"Warning: Error during pagination after {len(all_documents)} docs: {e}")
+            if received_count:
+                print(f"Warning: Error during pagination after {received_count} docs: {e}")
                 print("Continuing with documents retrieved so far...")
             else:
                 print(f"Warning: Error fetching from location '{args.location}': {e}")
@@ -110,35 +166,13 @@ def main():
                     traceback.print_exc()
 
         if args.verbose:
-            print(f"Received {len(all_documents)} documents from API")
-
-        # Filter by category locally (API category filter is buggy)
-        if args.category:
-            filtered = [
-                d for d in all_documents
-                if hasattr(d, 'category') and d.category in args.category
-            ]
-            if args.verbose:
-                print(f"After category filter ({', '.join(args.category)}): {len(filtered)} documents")
-        else:
-            filtered = all_documents
-
-        # Filter by existing tag if specified
-        if args.has_tag:
-            filtered = [
-                d for d in filtered
-                if hasattr(d, 'tags') and d.tags and args.has_tag in d.tags
-            ]
-            if args.verbose:
-                print(f"After tag filter (has '{args.has_tag}'): {len(filtered)} documents")
-
-        # Skip documents that already have the target tag
-        to_tag = [
-            d for d in filtered
-            if not (hasattr(d, 'tags') and d.tags and args.add_tag in d.tags)
-        ]
-
-        already_tagged = len(filtered) - len(to_tag)
+            print(f"Received {received_count} documents from API")
+            if args.category:
+                print(f"Category filter: {', '.join(args.category)}")
+            if args.has_tag:
+                print(f"Tag filter: has '{args.has_tag}'")
+            print(f"After filters: {len(to_tag) + already_tagged} documents")
+
         if already_tagged > 0:
             print(f"Skipping {already_tagged} documents that already have tag '{args.add_tag}'")
 
@@ -149,35 +183,44 @@ def main():
             print("No documents to tag.")
             return
 
-        # Process documents
+        # Process documents, overlapping the PATCH round-trips on a thread pool
         success_count = 0
         error_count = 0
+        futures = {}
+
+        # Check once so tag lists are only joined when they are shown
+        show_details = log.isEnabledFor(logging.DEBUG)
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for i, (d, tagset) in enumerate(to_tag, 1):
+                title = getattr(d, 'title', 'N/A')
 
-        for i, d in enumerate(to_tag, 1):
-            title = d.title if hasattr(d, 'title') else 'N/A'
-            category = d.category if hasattr(d, 'category') else 'N/A'
+                # Merge existing tags with new tag
+                existing_tags = sorted(tagset)
+                new_tags = existing_tags + [args.add_tag]
 
-            # Merge existing tags with new tag
-            existing_tags = list(d.tags.keys()) if hasattr(d, 'tags') and d.tags else []
-            new_tags = existing_tags + [args.add_tag]
+                if show_details:
+                    log.debug(
+                        "[%d/%d] %s\n  Category: %s\n  Current tags: %s\n  New tags: %s\n",
+                        i, len(to_tag), title, getattr(d, 'category', 'N/A'),
+                        ', '.join(existing_tags) or 'none', ', '.join(new_tags)
+                    )
 
-            if args.verbose or args.dry_run:
-                print(f"[{i}/{len(to_tag)}] {title}")
-                print(f"  Category: {category}")
-                print(f"  Current tags: {', '.join(existing_tags) if existing_tags else 'none'}")
-                print(f"  New tags: {', '.join(new_tags)}")
+                if not args.dry_run:
+                    futures[executor.submit(update_document_tags, d.id, new_tags)] = title
 
-            if not args.dry_run:
-                if update_document_tags(d.id, new_tags, READWISE_TOKEN):
+            for future in as_completed(futures):
+                title = futures[future]
+                if future.result():
                     success_count += 1
-                    if args.verbose:
-                        print("  Status: Tagged successfully")
+                    log.debug("Tagged successfully: %s", title)
                 else:
                     error_count += 1
-                    print(f"  Status: Failed to tag")
+                    print(f"Failed to tag: {title}")
 
-            if args.verbose or args.dry_run:
-                print()
+        # Cached listings no longer reflect the updated tags
+        if success_count:
+            clear_cache()
 
         # Summary
         if args.dry_run:
@@ -189,6 +232,8 @@ def main():
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        _session.close()
 
 
 if __name__ == "__main__":
@@ -13,36 +13,35 @@ The tool tracks already processed documents to avoid duplicates.
 """
 
 import os
+import json
+import uuid
+import argparse
 from dotenv import load_dotenv
 from readwise import ReadwiseReader
-from todoist_api_python.api import TodoistAPI
+from readwise_tools._cache import get_documents_cached
+from readwise_tools._http import create_session
+from readwise_tools._state import StateStore
 
 load_dotenv()
 
 READWISE_TOKEN = os.getenv("READWISE_TOKEN")
 TODOIST_TOKEN = os.getenv("TODOIST_TOKEN")
-STATE_FILE = os.path.expanduser("~/.readwise_todoist_transferred")
+STATE_DB = os.path.expanduser("~/.readwise_todoist_transferred.db")
+# Line-based state file used before STATE_DB, imported on first run
+LEGACY_STATE_FILE = os.path.expanduser("~/.readwise_todoist_transferred")
+TODOIST_SYNC_URL = "https://api.todoist.com/api/v1/sync"
+BATCH_SIZE = 100
 
 
-def load_transferred_highlights():
+def get_readwise_documents_with_todoist_tag(readwise_client, use_cache=True):
     try:
-        with open(STATE_FILE, 'r') as f:
-            return set(line.strip() for line in f if line.strip())
-    except FileNotFoundError:
-        return set()
-
-
-def append_transferred_highlight(highlight_id):
-    with open(STATE_FILE, 'a') as f:
-        f.write(str(highlight_id) + '\n')
-
-
-def get_readwise_documents_with_todoist_tag(readwise_client):
-    try:
-        documents = readwise_client.get_documents(
-            params={
+        documents = get_documents_cached(
+            readwise_client,
+            {
                 "tag": "todoist"
-            }
+            },
+            READWISE_TOKEN,
+            use_cache=use_cache
         )
         return list(documents)
     except Exception as e:
@@ -50,7 +49,8 @@ def get_readwise_documents_with_todoist_tag(readwise_client):
         return []
 
 
-def create_todoist_task(document, todoist_api):
+def build_task_command(document):
+    """Build a Todoist Sync API item_add command for a document."""
     # Handle case where title might be None
     title = getattr(document, 'title', None) or "Untitled Document"
     task_content = title[:500]
@@ -72,20 +72,56 @@ def create_todoist_task(document, todoist_api):
 
     description = "\n".join(description_parts) if description_parts else ""
 
+    return {
+        "type": "item_add",
+        "temp_id": str(uuid.uuid4()),
+        "uuid": str(uuid.uuid4()),
+        "args": {
+            "content": task_content,
+            "description": description,
+            "labels": ["readwise", "reader"],
+            "due": {"string": "today"}
+        }
+    }
+
+
+def send_task_commands(session, commands):
+    """Send a batch of commands in one Sync API request.
+
+    Returns a dict mapping each command uuid to "ok" or the error Todoist
+    reported for it.
+    """
     try:
-        task = todoist_api.add_task(
-            content=task_content,
-            description=description,
-            labels=["readwise", "reader"],
-            due_string="today"
-        )
-        return task
+        response = session.post(TODOIST_SYNC_URL, data={"commands": json.dumps(commands)})
+        response.raise_for_status()
+        sync_status = response.json().get("sync_status", {})
     except Exception as e:
-        print(f"Failed to create Todoist task: {e}")
-        return None
+        return {command["uuid"]: str(e) for command in commands}
+
+    results = {}
+    for command in commands:
+        status = sync_status.get(command["uuid"], "no status returned")
+        if isinstance(status, dict):
+            # Failed commands report {"error_code": ..., "error": "..."}
+            status = status.get("error", status)
+        results[command["uuid"]] = status
+    return results
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create Todoist tasks from Reader documents tagged 'todoist'",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--no-cache", action="store_true", help="always fetch documents instead of reusing a recent listing")
+    return parser.parse_args()
 
 
 def main():
+    # Parse first so --help works without a .env file
+    args = parse_arguments()
+
     if not (READWISE_TOKEN and TODOIST_TOKEN):
         print("Missing environment variables. Check your .env file.")
         print("Required: READWISE_TOKEN, TODOIST_TOKEN")
@@ -93,35 +129,46 @@ def main():
 
     try:
         readwise_client = ReadwiseReader(token=READWISE_TOKEN)
-        todoist_api = TodoistAPI(TODOIST_TOKEN)
-        transferred_ids = load_transferred_highlights()
 
         print("Fetching Readwise documents tagged with 'todoist'...")
-        documents = get_readwise_documents_with_todoist_tag(readwise_client)
+        documents = get_readwise_documents_with_todoist_tag(readwise_client, use_cache=not args.no_cache)
 
         if not documents:
             print("No documents found with 'todoist' tag.")
             return
 
-        new_transfers = 0
-        for document in documents:
-            document_id = str(getattr(document, 'id', 'unknown'))
-            if document_id not in transferred_ids:
-                title = getattr(document, 'title', None) or "Untitled Document"
-                print(f"Creating Todoist task from: {title[:100]}...")
-                task = create_todoist_task(document, todoist_api)
+        # Commands carry a uuid that Todoist deduplicates on, so retrying the POST is safe
+        with StateStore(STATE_DB, legacy_path=LEGACY_STATE_FILE) as transferred_ids, \
+                create_session(retry_methods={"POST"}) as session:
+            session.headers["Authorization"] = f"Bearer {TODOIST_TOKEN}"
 
-                if task:
-                    append_transferred_highlight(document_id)
-                    new_transfers += 1
-                    print(f"✓ Task created: {task.content}")
-                else:
-                    print(f"✗ Failed to create task for document {document_id}")
-            else:
+            pending = []
+            for document in documents:
+                document_id = str(getattr(document, 'id', 'unknown'))
                 title = getattr(document, 'title', None) or "Untitled Document"
-                print(f"Skipping already transferred document: {title[:50]}...")
-
-        print(f"Transferred {new_transfers} new documents to Todoist. Total tracked: {len(transferred_ids) + new_transfers}")
+                if document_id not in transferred_ids:
+                    print(f"Creating Todoist task from: {title[:100]}...")
+                    pending.append((document_id, build_task_command(document)))
+                else:
+                    print(f"Skipping already transferred document: {title[:50]}...")
+
+            # Send commands in batches instead of one request per task
+            new_transfers = 0
+            for start in range(0, len(pending), BATCH_SIZE):
+                batch = pending[start:start + BATCH_SIZE]
+                statuses = send_task_commands(session, [command for _, command in batch])
+                for document_id, command in batch:
+                    status = statuses[command["uuid"]]
+                    if status == "ok":
+                        transferred_ids.add(document_id)
+                        new_transfers += 1
+                        print(f"✓ Task created: {command['args']['content']}")
+                    else:
+                        print(f"✗ Failed to create task for document {document_id}: {status}")
+                # Persist each batch so a crash can't lose created tasks' ids
+                transferred_ids.commit()
+
+            print(f"Transferred {new_transfers} new documents to Todoist. Total tracked: {len(transferred_ids)}")
 
     except Exception as e:
         print(f"Error: {e}")